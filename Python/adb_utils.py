@@ -1,88 +1,735 @@
+import asyncio
+import atexit
 import subprocess
 import logging
-from typing import Optional, List
+import queue
+import re
+import shlex
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, List, Tuple, Union
 
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application (see main.py), not on import
 logger = logging.getLogger(__name__)
 
-def adb_shell(cmd: str) -> str:
+# Idle shell sessions kept around for reuse; extra sessions opened under
+# concurrent load are closed once they are released.
+_MAX_IDLE_SESSIONS = 4
+
+# Frame emitted after each command by adb_shell_multi: \x1e<index>\x1e<status>\x1e
+_FRAME_RE = re.compile(r"\x1e(\d+)\x1e(\d+)\x1e", re.ASCII)
+
+
+class _ShellSession:
+    """
+    Long-lived `adb shell` process that runs commands written to its stdin.
+
+    Each command is followed by a sentinel carrying its exit status, and
+    stdout is read until the sentinel shows up. This avoids spawning a new
+    adb client and device shell for every command. Output is read as bytes
+    and decoded once per command.
+
+    Commands run in a subshell, so `cd`, variables, `set` options and `exit`
+    don't carry over to the next command on the pooled session. Background
+    jobs (`cmd &`) are waited for before the sentinel is printed.
+    """
+
+    def __init__(self, serial: Optional[str] = None):
+        self._sentinel = f"__ADB_END_{uuid.uuid4().hex}__"
+        self._sentinel_bytes = self._sentinel.encode()
+        self._proc = subprocess.Popen(
+            ["adb"] + (["-s", serial] if serial else []) + ["shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        self._stdout: queue.Queue = queue.Queue()
+        self._stderr: queue.Queue = queue.Queue()
+        self._pumps = [
+            threading.Thread(target=self._pump, args=(stream, lines), daemon=True)
+            for stream, lines in ((self._proc.stdout, self._stdout), (self._proc.stderr, self._stderr))
+        ]
+        for pump in self._pumps:
+            pump.start()
+
+    @staticmethod
+    def _pump(stream, lines: queue.Queue) -> None:
+        """Forward lines from a pipe into a queue, with None marking EOF; closes the pipe."""
+        with stream:
+            for line in stream:
+                lines.put(line)
+        lines.put(None)
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def close(self) -> None:
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+        try:
+            self._proc.stdin.close()
+        except OSError:
+            pass
+        # The pumps close stdout/stderr once they hit EOF
+        for pump in self._pumps:
+            pump.join(timeout=1)
+
+    def _drain_stderr(self, wait: float = 0) -> str:
+        """Collect pending stderr, optionally waiting up to `wait` seconds for EOF."""
+        deadline = time.monotonic() + wait
+        lines = []
+        while True:
+            try:
+                line = self._stderr.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if line is None:
+                break
+            lines.append(line)
+        return b"".join(lines).decode("utf-8", "replace").strip()
+
+    def run(self, cmd: str, timeout: float) -> str:
+        """
+        Run a command in the session and return its raw stdout.
+
+        Raises subprocess.TimeoutExpired / CalledProcessError like
+        subprocess.check_output, and ConnectionError if the shell exits.
+        """
+        self._drain_stderr()
+        script = (
+            f"( {cmd}\n__adb_rc=$?; wait; exit $__adb_rc\n) </dev/null\n"
+            f"printf '{self._sentinel}%d\\n' $?\n"
+        )
+        self._proc.stdin.write(script.encode())
+        self._proc.stdin.flush()
+
+        deadline = time.monotonic() + timeout
+        lines = []
+        while True:
+            try:
+                line = self._stdout.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self.close()
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            if line is None:
+                self.close()
+                raise ConnectionError(self._drain_stderr(wait=1) or "adb shell session closed")
+            pos = line.find(self._sentinel_bytes)
+            if pos >= 0:
+                lines.append(line[:pos])
+                returncode = int(line[pos + len(self._sentinel_bytes):])
+                break
+            lines.append(line)
+
+        output = b"".join(lines).decode("utf-8", "replace")
+        if returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode, cmd, output=output, stderr=self._drain_stderr()
+            )
+        return output
+
+
+# Idle session pools keyed by device serial (None = adb's default device)
+_idle_sessions: Dict[Optional[str], queue.LifoQueue] = {}
+_idle_sessions_lock = threading.Lock()
+
+# Cached serials of connected devices, reset when a session drops
+_serials: Optional[List[str]] = None
+
+# Opt-in result cache for adb_shell: (serial, cmd) -> (expires_at, output)
+_MAX_RESULT_CACHE = 512
+_result_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _session_pool(serial: Optional[str]) -> queue.LifoQueue:
+    with _idle_sessions_lock:
+        pool = _idle_sessions.get(serial)
+        if pool is None:
+            pool = _idle_sessions[serial] = queue.LifoQueue(maxsize=_MAX_IDLE_SESSIONS)
+        return pool
+
+
+def _acquire_session(serial: Optional[str]) -> _ShellSession:
+    pool = _session_pool(serial)
+    while True:
+        try:
+            session = pool.get_nowait()
+        except queue.Empty:
+            return _ShellSession(serial)
+        if session.alive():
+            return session
+        session.close()
+
+
+def _release_session(session: _ShellSession, serial: Optional[str]) -> None:
+    if not session.alive():
+        return
+    try:
+        _session_pool(serial).put_nowait(session)
+    except queue.Full:
+        session.close()
+
+
+def adb_close_sessions() -> None:
+    """
+    Close every idle pooled shell session (sessions in use close on release)
+    and stop the `adb track-devices` child.
+    """
+    _tracker.stop()
+    with _idle_sessions_lock:
+        pools = list(_idle_sessions.values())
+    for pool in pools:
+        while True:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+atexit.register(adb_close_sessions)
+
+
+def _run_in_session(cmd: str, serial: Optional[str], timeout: float) -> str:
+    """Run a command on a pooled shell session, respawning it once if its pipe broke."""
+    for attempt in range(2):
+        session = _acquire_session(serial)
+        try:
+            return session.run(cmd, timeout)
+        except BrokenPipeError:
+            session.close()
+            if attempt:
+                raise
+        finally:
+            _release_session(session, serial)
+
+
+def _run_adb(args: List[str], timeout: float) -> bytes:
+    """
+    Spawn a one-off adb client and return its stdout.
+
+    Keep this to plain subprocess.run arguments: preexec_fn, user/group or
+    session options force CPython off its vfork() spawn path on Linux.
+    stderr is discarded on the first attempt; a failing command is run once
+    more with stderr captured so CalledProcessError carries the message.
+    """
+    argv = ["adb"] + args
+    try:
+        return subprocess.run(
+            argv, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=timeout, check=True
+        ).stdout
+    except subprocess.CalledProcessError:
+        return subprocess.run(argv, capture_output=True, timeout=timeout, check=True).stdout
+
+
+def adb_shell(
+    cmd: Union[str, List[str]],
+    serial: Optional[str] = None,
+    timeout: float = 10,
+    cache_ttl: float = 0
+) -> str:
     """
     Run an adb shell command and return stdout.
     Raises RuntimeError if command fails.
+
+    `cmd` is either a shell command line or an argv list, which is quoted
+    so its arguments reach the program verbatim. Commands run on a
+    persistent `adb shell` session instead of spawning a new adb process per
+    call. Pass `serial` to target a specific device. With `cache_ttl` > 0
+    the output of a read-only command is reused for that many seconds; see
+    adb_shell_invalidate.
     """
+    if not isinstance(cmd, str):
+        cmd = shlex.join(cmd)
+    key = (serial, cmd)
+    if cache_ttl > 0:
+        with _result_cache_lock:
+            entry = _result_cache.get(key)
+            if entry and time.monotonic() < entry[0]:
+                _result_cache.move_to_end(key)
+                return entry[1]
+
+    result = _shell_output(cmd, serial, timeout).strip()
+    if cache_ttl > 0:
+        with _result_cache_lock:
+            _result_cache[key] = (time.monotonic() + cache_ttl, result)
+            _result_cache.move_to_end(key)
+            if len(_result_cache) > _MAX_RESULT_CACHE:
+                _result_cache.popitem(last=False)
+    return result
+
+
+def _shell_output(cmd: str, serial: Optional[str], timeout: float) -> str:
+    """Raw (unstripped) output of a command on a pooled session, with adb_shell's error mapping."""
+    global _serials
     try:
-        result = subprocess.check_output(
-            ["adb", "shell", cmd],
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=10
-        ).strip()
-        logger.info(f"ADB command executed: {cmd[:50]}...")
-        return result
+        output = _run_in_session(cmd, serial, timeout)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("ADB command executed: %s...", cmd[:50])
+        return output
     except subprocess.TimeoutExpired:
-        logger.error(f"ADB command timeout: {cmd}")
+        logger.error("ADB command timeout: %s", cmd)
         raise RuntimeError("Command timed out")
     except subprocess.CalledProcessError as e:
-        logger.error(f"ADB command failed: {cmd} - {e.stderr}")
+        logger.error("ADB command failed: %s - %s", cmd, e.stderr)
         raise RuntimeError(f"ADB command failed: {e.stderr}")
     except FileNotFoundError:
         logger.error("ADB not found. Ensure ADB is installed and in PATH")
         raise RuntimeError("ADB not found. Ensure ADB is installed and in PATH")
+    except OSError as e:
+        _serials = None
+        logger.error("ADB shell session failed: %s - %s", cmd, e)
+        raise RuntimeError(f"ADB shell session failed: {e}")
+
+
+def adb_shell_invalidate(pattern: Optional[str] = None) -> None:
+    """
+    Drop cached adb_shell results.
+
+    Clears everything, or only commands containing `pattern`. Call after
+    commands that change device state (install, push, settings).
+    """
+    with _result_cache_lock:
+        if pattern is None:
+            _result_cache.clear()
+            return
+        for key in [k for k in _result_cache if pattern in k[1]]:
+            del _result_cache[key]
+
+
+def adb_exec_out(cmd: str, serial: Optional[str] = None, timeout: float = 10) -> str:
+    """
+    Run a command via `adb exec-out` and return stdout.
+
+    exec-out skips the pty layer and its newline translation, which suits
+    commands that dump large outputs. Raises RuntimeError if command fails.
+    """
+    args = (["-s", serial] if serial else []) + ["exec-out", cmd]
+    try:
+        raw = _run_adb(args, timeout)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("ADB command executed: %s...", cmd[:50])
+        return raw.decode("utf-8", "replace").strip()
+    except subprocess.TimeoutExpired:
+        logger.error("ADB command timeout: %s", cmd)
+        raise RuntimeError("Command timed out")
+    except subprocess.CalledProcessError as e:
+        err = e.stderr.decode("utf-8", "replace")
+        logger.error("ADB command failed: %s - %s", cmd, err)
+        raise RuntimeError(f"ADB command failed: {err}")
+    except FileNotFoundError:
+        logger.error("ADB not found. Ensure ADB is installed and in PATH")
+        raise RuntimeError("ADB not found. Ensure ADB is installed and in PATH")
+
+
+def adb_shell_iter(cmd: str, serial: Optional[str] = None, timeout: float = 10) -> Iterator[str]:
+    """
+    Run an adb shell command and yield stdout lines as they arrive.
+
+    Lets callers parse large outputs (logcat -d, dumpsys meminfo) without
+    holding the whole output in memory. The adb process is killed after
+    `timeout` seconds. Raises RuntimeError if command fails.
+    """
+    argv = ["adb"] + (["-s", serial] if serial else []) + ["shell", cmd]
+    # stderr goes to a file rather than a pipe nobody reads until stdout
+    # ends, so a chatty command can't block on a full stderr pipe
+    errfile = tempfile.TemporaryFile()
+    try:
+        proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=errfile)
+    except FileNotFoundError:
+        errfile.close()
+        logger.error("ADB not found. Ensure ADB is installed and in PATH")
+        raise RuntimeError("ADB not found. Ensure ADB is installed and in PATH")
+
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            yield line.decode("utf-8", "replace").rstrip("\r\n")
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+        errfile.seek(0)
+        err = errfile.read().decode("utf-8", "replace")
+        errfile.close()
+
+    if timed_out.is_set():
+        logger.error("ADB command timeout: %s", cmd)
+        raise RuntimeError("Command timed out")
+    if proc.returncode != 0:
+        logger.error("ADB command failed: %s - %s", cmd, err)
+        raise RuntimeError(f"ADB command failed: {err}")
+
+
+async def adb_shell_async(cmd: str, serial: Optional[str] = None) -> str:
+    """
+    Run an adb shell command without blocking the event loop.
+
+    Spawns its own adb process (optionally targeting `serial`), so many calls
+    can be awaited concurrently. Raises RuntimeError if command fails.
+    """
+    argv = ["adb"] + (["-s", serial] if serial else []) + ["shell", cmd]
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except FileNotFoundError:
+        logger.error("ADB not found. Ensure ADB is installed and in PATH")
+        raise RuntimeError("ADB not found. Ensure ADB is installed and in PATH")
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=10)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        logger.error("ADB command timeout: %s", cmd)
+        raise RuntimeError("Command timed out")
+
+    if proc.returncode != 0:
+        err = stderr.decode("utf-8", "replace")
+        logger.error("ADB command failed: %s - %s", cmd, err)
+        raise RuntimeError(f"ADB command failed: {err}")
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("ADB command executed: %s...", cmd[:50])
+    return stdout.decode("utf-8", "replace").strip()
+
+
+async def adb_shell_many(cmds: List[str], serial: Optional[str] = None, concurrency: int = 16) -> List[str]:
+    """
+    Run independent adb shell commands concurrently.
+
+    At most `concurrency` adb processes run at once. Returns outputs aligned
+    with the input commands, with an empty string for failed commands.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(cmd: str) -> str:
+        async with semaphore:
+            try:
+                return await adb_shell_async(cmd, serial)
+            except RuntimeError:
+                return ""
+
+    return list(await asyncio.gather(*(run(cmd) for cmd in cmds)))
+
+
+def adb_shell_parallel(cmds: List[str], serial: Optional[str] = None, concurrency: int = 16) -> List[str]:
+    """Synchronous wrapper around adb_shell_many; not for use inside a running event loop."""
+    return asyncio.run(adb_shell_many(cmds, serial, concurrency))
+
+
+class _DeviceTracker:
+    """
+    Background reader for `adb track-devices`.
+
+    The adb server pushes a length-prefixed device list (4 hex digits, then
+    `serial\tstate` lines) whenever a device connects, disconnects or changes
+    state, so the latest list can be served without spawning adb.
+    """
+
+    def __init__(self):
+        self._devices: Optional[List[Tuple[str, str]]] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._proc: Optional[subprocess.Popen] = None
+        self._stopped = False
+
+    def start(self) -> None:
+        """Start the tracker thread, or restart it if adb track-devices exited."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._track, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Kill the `adb track-devices` child and wait for the reader to finish.
+
+        The child blocks on the adb server socket, so it would otherwise
+        outlive the (daemon) reader thread at interpreter exit.
+        """
+        with self._lock:
+            self._stopped = True
+            proc, thread = self._proc, self._thread
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+        if thread is not None:
+            thread.join(timeout=1)
+
+    def devices(self, wait: float) -> Optional[List[Tuple[str, str]]]:
+        """Return the tracked (serial, state) list, or None if the tracker is not running."""
+        self._ready.wait(wait)
+        return self._devices
+
+    def _track(self) -> None:
+        global _serials
+        try:
+            proc = subprocess.Popen(
+                ["adb", "track-devices"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        except FileNotFoundError:
+            logger.error("ADB not found. Ensure ADB is installed and in PATH")
+            self._ready.set()
+            return
+
+        with self._lock:
+            self._proc = proc
+            if self._stopped:
+                proc.kill()
+
+        try:
+            while True:
+                header = proc.stdout.read(4)
+                if len(header) < 4:
+                    break
+                payload = proc.stdout.read(int(header, 16)).decode("utf-8", "replace")
+                self._devices = [
+                    tuple(line.split("\t", 1)) for line in payload.splitlines() if "\t" in line
+                ]
+                _serials = None
+                self._ready.set()
+        except ValueError as e:
+            logger.error("Unexpected adb track-devices output: %s", e)
+        finally:
+            self._devices = None
+            _serials = None
+            self._ready.set()
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            proc.stdout.close()
+            with self._lock:
+                self._proc = None
+
+
+_tracker = _DeviceTracker()
+
+
+# Last `adb devices` output used while the tracker has no snapshot: (fetched_at, output)
+_DEVICES_FALLBACK_TTL = 1.0
+_devices_fallback: Optional[Tuple[float, str]] = None
 
 
 def adb_devices() -> Optional[str]:
-    """Check connected ADB devices."""
+    """
+    Check connected ADB devices.
+
+    Served from a background `adb track-devices` stream once it has reported,
+    falling back to running `adb devices` (reused for up to a second).
+    """
+    _tracker.start()
+    devices = _tracker.devices(wait=1)
+    if devices is not None:
+        return "\n".join(["List of devices attached"] + [f"{serial}\t{state}" for serial, state in devices])
+
+    global _devices_fallback
+    cached = _devices_fallback
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < _DEVICES_FALLBACK_TTL:
+        return cached[1]
+
+    try:
+        output = _run_adb(["devices"], timeout=5).decode("utf-8", "replace").strip()
+    except Exception as e:
+        logger.error("Failed to check devices: %s", e)
+        return None
+    _devices_fallback = (now, output)
+    return output
+
+
+def adb_get_state(serial: Optional[str] = None) -> Optional[str]:
+    """
+    Return the device state (device, offline, bootloader, ...) via `adb get-state`.
+
+    Answered by the adb server without starting a shell on the device.
+    Returns None if no device is reachable.
+    """
+    try:
+        return _run_adb((["-s", serial] if serial else []) + ["get-state"], timeout=5).decode().strip()
+    except Exception as e:
+        logger.error("Failed to get device state: %s", e)
+        return None
+
+
+def adb_get_serialno() -> Optional[str]:
+    """Return the default device's serial via `adb get-serialno`, without a device shell."""
     try:
-        result = subprocess.check_output(
-            ["adb", "devices"],
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=5
-        ).strip()
-        return result
+        return _run_adb(["get-serialno"], timeout=5).decode().strip()
     except Exception as e:
-        logger.error(f"Failed to check devices: {e}")
+        logger.error("Failed to get device serial: %s", e)
         return None
 
 
-def adb_shell_multi(cmds: List[str]) -> List[str]:
+def adb_serials(refresh: bool = False) -> List[str]:
+    """
+    Return serials of devices in the `device` state.
+
+    The list is cached until `refresh` is set or a shell session drops.
+    """
+    global _serials
+    if _serials is None or refresh:
+        devices = adb_devices()
+        serials = []
+        for line in (devices or "").splitlines()[1:]:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1] == "device":
+                serials.append(parts[0])
+        _serials = serials
+    return _serials
+
+
+def adb_shell_fanout(cmd: str, serials: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Run the same adb shell command on several devices concurrently.
+
+    Defaults to every connected device. Returns outputs keyed by serial, with
+    an empty string for devices where the command failed.
+    """
+    if serials is None:
+        serials = adb_serials()
+    if not serials:
+        return {}
+
+    def run(serial: str) -> str:
+        try:
+            return adb_shell(cmd, serial)
+        except RuntimeError:
+            return ""
+
+    with ThreadPoolExecutor(max_workers=min(32, len(serials))) as executor:
+        return dict(zip(serials, executor.map(run, serials)))
+
+
+def _results_list(n: int, out: Optional[List[str]]) -> List[str]:
+    """Return `out` with its first `n` entries reset if it is large enough, else a new list."""
+    if out is None or len(out) < n:
+        return [""] * n
+    for i in range(n):
+        out[i] = ""
+    return out
+
+
+def _split_multi(output: str, n: int, out: Optional[List[str]] = None) -> List[str]:
+    """Split framed adb_shell_multi output into `n` per-command outputs."""
+    results = _results_list(n, out)
+    start = 0
+
+    # Each frame closes the output slice that precedes it
+    for match in _FRAME_RE.finditer(output):
+        idx = int(match.group(1))
+        if idx < n:
+            results[idx] = output[start:match.start()].strip()
+        start = match.end()
+
+    return results
+
+
+def adb_shell_multi(
+    cmds: List[str],
+    serial: Optional[str] = None,
+    out: Optional[List[str]] = None,
+    timeout: float = 10
+) -> List[str]:
     """
     Run multiple adb shell commands in a single call.
 
-    Uses a marker line to split outputs safely, and returns a list of outputs
-    aligned with the input commands.
+    Each command is followed by a record-separator (0x1e) delimited frame
+    holding its index and exit status, and returns a list of outputs aligned
+    with the input commands. The batch is sent as a newline-delimited script
+    over the shell session's stdin, so it is not bound by argv length limits.
+
+    Callers polling with the same batch can pass the previous result as
+    `out`; when it has room for every command it is filled in place and
+    returned instead of allocating a new list. `timeout` covers the whole
+    batch; on timeout or failure every output is empty.
     """
     if not cmds:
         return []
+    if len(cmds) == 1:
+        results = _results_list(1, out)
+        try:
+            results[0] = adb_shell(cmds[0], serial, timeout)
+        except RuntimeError:
+            pass
+        return results
 
-    marker = "__ADB_MULTI__"
-    combined = ""
-    for i, cmd in enumerate(cmds):
-        combined += f"echo {marker}{i}; {cmd}; "
+    # Waiting before each frame keeps output of `cmd &` inside its own slot
+    combined = "".join(
+        f"{cmd}\n__adb_rc=$?; wait; printf '\\036%d\\036%d\\036' {i} $__adb_rc\n"
+        for i, cmd in enumerate(cmds)
+    )
 
+    # Unstripped: str.strip treats \x1e as whitespace and would eat the
+    # frames of leading or trailing commands that print nothing
     try:
-        output = adb_shell(combined)
+        output = _shell_output(combined, serial, timeout)
     except RuntimeError:
-        return [""] * len(cmds)
+        return _results_list(len(cmds), out)
 
-    results = [""] * len(cmds)
-    current = -1
-    buffer = []
+    return _split_multi(output, len(cmds), out)
 
-    for line in output.splitlines():
-        if line.startswith(marker):
-            if current >= 0:
-                results[current] = "\n".join(buffer).strip()
-            buffer = []
-            try:
-                current = int(line[len(marker):])
-            except ValueError:
-                current += 1
-        else:
-            if current >= 0:
-                buffer.append(line)
 
-    if current >= 0:
-        results[current] = "\n".join(buffer).strip()
+class Batcher:
+    """
+    Collect adb shell commands and run them as one adb_shell_multi call.
 
-    return results
+    Use as `with Batcher() as batch:`; `schedule(cmd)` returns a Future that
+    resolves when the batch is flushed on exit, or early once `max_batch`
+    commands are pending.
+    """
+
+    def __init__(self, serial: Optional[str] = None, max_batch: Optional[int] = None):
+        self._serial = serial
+        self._max_batch = max_batch
+        self._cmds: List[str] = []
+        self._futures: List[Future] = []
+
+    def schedule(self, cmd: str) -> Future:
+        future: Future = Future()
+        self._cmds.append(cmd)
+        self._futures.append(future)
+        if self._max_batch and len(self._cmds) >= self._max_batch:
+            self.flush()
+        return future
+
+    def flush(self) -> None:
+        """Run all pending commands and resolve their futures."""
+        if not self._cmds:
+            return
+        cmds, futures = self._cmds, self._futures
+        self._cmds, self._futures = [], []
+        for future, output in zip(futures, adb_shell_multi(cmds, self._serial)):
+            future.set_result(output)
+
+    def __enter__(self) -> "Batcher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            for future in self._futures:
+                future.cancel()
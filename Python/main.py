@@ -3,46 +3,88 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from anyio import to_thread
 import logging
 import asyncio
+import os
 import re
+import threading
+import time
 
-from adb_utils import adb_shell, adb_devices, adb_shell_multi
+from adb_utils import adb_shell, adb_devices, adb_shell_multi, adb_close_sessions
 from parsers import (
-    parse_key_value_block, parse_cpu_freq, parse_cpu_frequencies_detailed, parse_thermal_data,
+    parse_battery_output, parse_cpu_freq, parse_cpu_frequencies_detailed, parse_thermal_data,
     parse_battery_level, kb_to_mb, kb_to_gb, parse_path_value_block, parse_df_output,
-    parse_cpu_idle_output
+    parse_cpu_idle_output, parse_getprop_output
 )
 
+# Per-command ADB logging is INFO; the default keeps it off the request path
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING").upper())
 logger = logging.getLogger(__name__)
 
+_CPU_CORE_RE = re.compile(r"^cpu\d+$", re.ASCII)
+_MEMINFO_RE = re.compile(r"^(MemTotal|MemAvailable|SwapTotal|SwapFree):\s+(\d+)", re.M | re.ASCII)
+
+# cpuinfo_min_freq / cpuinfo_max_freq are hardware limits, read once per process
+_cpu_freq_limits: Optional[Tuple[int, int]] = None
+
 # ============ SIMPLE IN-MEMORY CACHE ============
 _cache: Dict[str, Any] = {}
+# Builders read and write the cache from worker threads
+_cache_lock = threading.Lock()
 
 
 def _get_cached(key: str, ttl_seconds: int) -> Optional[Any]:
-    entry = _cache.get(key)
+    with _cache_lock:
+        entry = _cache.get(key)
     if not entry:
         return None
     cached_at, value = entry
-    if (datetime.now() - cached_at).total_seconds() > ttl_seconds:
+    if time.monotonic() - cached_at > ttl_seconds:
         return None
     return value
 
 
 def _set_cached(key: str, value: Any) -> None:
-    _cache[key] = (datetime.now(), value)
+    entry = (time.monotonic(), value)
+    with _cache_lock:
+        _cache[key] = entry
+
+
+# In-flight cache refreshes, so concurrent misses on one key share a single run
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _finish_inflight(key: str, future: asyncio.Future) -> None:
+    _inflight.pop(key, None)
+    if not future.cancelled() and future.exception() is None:
+        _set_cached(key, future.result())
 
 
 async def _get_cached_or_run(key: str, ttl_seconds: int, func):
+    return await _get_cached_or_await(key, ttl_seconds, lambda: run_in_threadpool(func))
+
+
+async def _get_cached_or_await(key: str, ttl_seconds: int, factory):
+    """Like _get_cached_or_run, for a coroutine factory instead of a sync builder."""
     cached = _get_cached(key, ttl_seconds)
     if cached is not None:
         return cached
-    result = await run_in_threadpool(func)
-    _set_cached(key, result)
-    return result
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(factory())
+        _inflight[key] = future
+        future.add_done_callback(lambda f: _finish_inflight(key, f))
+    return await asyncio.shield(future)
+
+
+async def _build_from(source: asyncio.Future, builder):
+    """Build a model from shared, already scheduled ADB data."""
+    return builder(await source)
 
 # ============ PYDANTIC MODELS ============
 class DeviceInfo(BaseModel):
@@ -227,13 +269,26 @@ class SystemInfo(BaseModel):
 
 
 # ============ FastAPI APP ============
+# Worker threads for blocking ADB calls; /system alone fans out to ~15 tasks
+THREAD_POOL_SIZE = int(os.environ.get("THREAD_POOL_SIZE", "128"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    to_thread.current_default_thread_limiter().total_tokens = THREAD_POOL_SIZE
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE))
+    yield
+    adb_close_sessions()
+
+
 app = FastAPI(
     title="DroidMetrics",
     description="Real-time Android system metrics via ADB (no root, no app required) - by bluecape",
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
 
 # ============ CORS MIDDLEWARE ============
@@ -261,7 +316,8 @@ async def runtime_error_handler(request, exc):
 async def health_check():
     """Check API health and ADB connection status."""
     try:
-        devices = adb_devices()
+        # adb_devices may wait on the device tracker or spawn `adb devices`
+        devices = await run_in_threadpool(adb_devices)
         is_connected = False
         if devices:
             lines = devices.splitlines()
@@ -550,6 +606,74 @@ async def uptime_info():
 
 
 # ============ FULL SYSTEM ENDPOINT ============
+async def _build_system_info() -> SystemInfo:
+    """Gather every section concurrently into one SystemInfo snapshot."""
+    now = datetime.now()
+    device_task = _get_cached_or_run("device_info", 300, _build_device_info)
+    os_task = _get_cached_or_run("os_info", 300, _build_os_info)
+    cpu_task = _get_cached_or_run("cpu_info", 300, _build_cpu_info)
+    cpu_gov_task = _get_cached_or_run("cpu_governors", 300, _build_cpu_governors)
+    mounts_task = _get_cached_or_run("storage_mounts", 30, _build_storage_mounts)
+    # Every uncached section is read in one ADB round trip and parsed from its segment
+    realtime = asyncio.ensure_future(run_in_threadpool(_get_realtime_outputs))
+    cpu_freq_task = _build_from(realtime, lambda out: _build_cpu_frequency(
+        out["cpu_freq"], out.get("cpu_min_freq"), out.get("cpu_max_freq")
+    ))
+    cpu_idle_task = _build_from(realtime, lambda out: _build_cpu_idle_info(out["cpu_idle"]))
+    memory_task = _build_from(realtime, lambda out: _build_memory_info(out["meminfo"]))
+    storage_task = _build_from(realtime, lambda out: _build_storage_info(out["storage"]))
+    # battery/power and thermal/core temps each share a single dumpsys segment
+    battery_data_task = asyncio.ensure_future(
+        _build_from(realtime, lambda out: _get_battery_data(out["battery"]))
+    )
+    thermal_data_task = asyncio.ensure_future(
+        _build_from(realtime, lambda out: _get_thermal_data(out["thermal"]))
+    )
+    battery_task = _build_from(battery_data_task, _build_battery_info)
+    power_task = _build_from(battery_data_task, _build_power_info)
+    thermal_task = _build_from(thermal_data_task, _build_thermal_info)
+    core_temps_task = _build_from(thermal_data_task, _build_core_temperatures)
+    network_task = _get_cached_or_run("network_info", 30, _build_network_info)
+    display_task = _get_cached_or_run("display_info", 300, _build_display_info)
+
+    device, osinfo, cpu, cpu_gov, cpu_freq, cpu_idle, memory, storage, mounts, battery, power, thermal, core_temps, network, display = await asyncio.gather(
+        device_task,
+        os_task,
+        cpu_task,
+        cpu_gov_task,
+        cpu_freq_task,
+        cpu_idle_task,
+        memory_task,
+        storage_task,
+        mounts_task,
+        battery_task,
+        power_task,
+        thermal_task,
+        core_temps_task,
+        network_task,
+        display_task
+    )
+    
+    return SystemInfo(
+        device=device,
+        os=osinfo,
+        cpu=cpu,
+        cpu_frequency=cpu_freq,
+        cpu_governors=cpu_gov,
+        cpu_idle=cpu_idle,
+        memory=memory,
+        storage=storage,
+        mounts=mounts,
+        battery=battery,
+        power=power,
+        thermal=thermal,
+        core_temperatures=core_temps,
+        network=network,
+        display=display,
+        timestamp=now
+    )
+
+
 @app.get("/system", response_model=SystemInfo, tags=["System"])
 async def system_info():
     """
@@ -559,109 +683,86 @@ async def system_info():
     Single endpoint for comprehensive system overview.
     """
     try:
-        device_task = _get_cached_or_run("device_info", 300, _build_device_info)
-        os_task = _get_cached_or_run("os_info", 300, _build_os_info)
-        cpu_task = _get_cached_or_run("cpu_info", 300, _build_cpu_info)
-        cpu_gov_task = _get_cached_or_run("cpu_governors", 300, _build_cpu_governors)
-        cpu_freq_task = run_in_threadpool(_build_cpu_frequency)
-        cpu_idle_task = run_in_threadpool(_build_cpu_idle_info)
-        memory_task = run_in_threadpool(_build_memory_info)
-        storage_task = run_in_threadpool(_build_storage_info)
-        mounts_task = _get_cached_or_run("storage_mounts", 30, _build_storage_mounts)
-        battery_task = run_in_threadpool(_build_battery_info)
-        power_task = run_in_threadpool(_build_power_info)
-        thermal_task = run_in_threadpool(_build_thermal_info)
-        core_temps_task = run_in_threadpool(_build_core_temperatures)
-        network_task = _get_cached_or_run("network_info", 30, _build_network_info)
-        display_task = _get_cached_or_run("display_info", 300, _build_display_info)
-
-        device, osinfo, cpu, cpu_gov, cpu_freq, cpu_idle, memory, storage, mounts, battery, power, thermal, core_temps, network, display = await asyncio.gather(
-            device_task,
-            os_task,
-            cpu_task,
-            cpu_gov_task,
-            cpu_freq_task,
-            cpu_idle_task,
-            memory_task,
-            storage_task,
-            mounts_task,
-            battery_task,
-            power_task,
-            thermal_task,
-            core_temps_task,
-            network_task,
-            display_task
-        )
-        
-        return SystemInfo(
-            device=device,
-            os=osinfo,
-            cpu=cpu,
-            cpu_frequency=cpu_freq,
-            cpu_governors=cpu_gov,
-            cpu_idle=cpu_idle,
-            memory=memory,
-            storage=storage,
-            mounts=mounts,
-            battery=battery,
-            power=power,
-            thermal=thermal,
-            core_temperatures=core_temps,
-            network=network,
-            display=display,
-            timestamp=datetime.now()
-        )
+        # Dashboards poll /system at several Hz; one ADB pass per second serves them all
+        return await _get_cached_or_await("system_info", 1, _build_system_info)
     except Exception as e:
         logger.error(f"System info error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # ============ INTERNAL BUILDERS (SYNC) ============
-def _build_device_info() -> DeviceInfo:
-    model, manufacturer, android_version, sdk, hardware, board = adb_shell_multi([
-        "getprop ro.product.model",
-        "getprop ro.product.manufacturer",
-        "getprop ro.build.version.release",
-        "getprop ro.build.version.sdk",
-        "getprop ro.hardware",
-        "getprop ro.board.platform"
-    ])
 
-    return DeviceInfo(
-        model=model,
-        manufacturer=manufacturer,
-        android_version=android_version,
-        sdk=int(sdk or 0),
-        hardware=hardware,
-        board=board,
+# Builders assemble trusted parser output, so models skip validation via
+# model_construct; SystemInfo and response_model still validate at the edge.
+
+
+# The device, OS and CPU builders miss the props cache together on a cold
+# /system; the lock makes them share one getprop dump instead of three
+_props_lock = threading.Lock()
+
+
+def _cache_props(getprop_raw: str) -> Dict[str, str]:
+    """Parse and cache a getprop dump; an empty one (adb down) is never cached."""
+    props = parse_getprop_output(getprop_raw)
+    if not props:
+        raise RuntimeError("getprop returned no properties (timeout or adb failure)")
+    _set_cached("all_props", props)
+    return props
+
+
+def _get_all_props() -> Dict[str, str]:
+    """Full `getprop` dump, shared by the device, OS and CPU builders for 300s."""
+    props = _get_cached("all_props", 300)
+    if props is None:
+        with _props_lock:
+            props = _get_cached("all_props", 300)
+            if props is None:
+                props = _cache_props(adb_shell("getprop"))
+    return props
+
+
+def _get_props_with(cmd: str) -> Tuple[Dict[str, str], str]:
+    """Cached getprop dump plus the output of `cmd`, fetched in one batch when the dump is cold."""
+    props = _get_cached("all_props", 300)
+    if props is None:
+        with _props_lock:
+            props = _get_cached("all_props", 300)
+            if props is None:
+                getprop_raw, output = adb_shell_multi(["getprop", cmd])
+                return _cache_props(getprop_raw), output
+    return props, adb_shell(cmd)
+
+
+def _build_device_info() -> DeviceInfo:
+    props = _get_all_props()
+
+    return DeviceInfo.model_construct(
+        model=props.get("ro.product.model", ""),
+        manufacturer=props.get("ro.product.manufacturer", ""),
+        android_version=props.get("ro.build.version.release", ""),
+        sdk=int(props.get("ro.build.version.sdk") or 0),
+        hardware=props.get("ro.hardware", ""),
+        board=props.get("ro.board.platform", ""),
     )
 
 
 def _build_os_info() -> OSInfo:
-    android_version, sdk, security_patch, build_id, kernel_version = adb_shell_multi([
-        "getprop ro.build.version.release",
-        "getprop ro.build.version.sdk",
-        "getprop ro.build.version.security_patch",
-        "getprop ro.build.display.id",
-        "uname -r"
-    ])
+    props, kernel_version = _get_props_with("uname -r")
 
-    return OSInfo(
-        android_version=android_version,
-        sdk=int(sdk or 0),
-        security_patch=security_patch,
-        build_id=build_id,
+    return OSInfo.model_construct(
+        android_version=props.get("ro.build.version.release", ""),
+        sdk=int(props.get("ro.build.version.sdk") or 0),
+        security_patch=props.get("ro.build.version.security_patch", ""),
+        build_id=props.get("ro.build.display.id", ""),
         kernel_version=kernel_version,
     )
 
 
 def _build_cpu_info() -> CPUInfo:
-    cores_str, abi, abi_list_raw = adb_shell_multi([
-        "nproc",
-        "getprop ro.product.cpu.abi",
-        "getprop ro.product.cpu.abilist"
-    ])
+    props, cores_str = _get_props_with("nproc")
     cores = int(cores_str or 0)
+    abi = props.get("ro.product.cpu.abi", "")
+    abi_list_raw = props.get("ro.product.cpu.abilist", "")
     abi_list = [a.strip() for a in abi_list_raw.split(",") if a.strip()]
 
     arch_map = {
@@ -672,7 +773,7 @@ def _build_cpu_info() -> CPUInfo:
     }
     arch = arch_map.get(abi, "Unknown")
 
-    return CPUInfo(
+    return CPUInfo.model_construct(
         cores=cores,
         abi=abi,
         abi_list=abi_list,
@@ -681,69 +782,84 @@ def _build_cpu_info() -> CPUInfo:
 
 
 def _build_cpu_governors() -> CPUGovernorInfo:
-    available_raw = adb_shell("cat /sys/devices/system/cpu/cpu0/cpufreq/scaling_available_governors")
+    available_raw, raw = adb_shell_multi([
+        "cat /sys/devices/system/cpu/cpu0/cpufreq/scaling_available_governors",
+        "grep -H . /sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_governor 2>/dev/null; true"
+    ])
     available = [g.strip() for g in available_raw.split() if g.strip()]
-
-    raw = adb_shell(
-        "for f in /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor; "
-        "do echo $f: $(cat $f); done"
-    )
     per_core = parse_path_value_block(raw)
 
-    return CPUGovernorInfo(
+    return CPUGovernorInfo.model_construct(
         per_core=per_core,
         available_governors=available
     )
 
 
-def _build_cpu_idle_info() -> CPUIdleInfo:
-    raw = adb_shell(
-        "for cpu in /sys/devices/system/cpu/cpu[0-9]*; do "
-        "c=$(basename $cpu); "
-        "for s in $cpu/cpuidle/state*; do "
-        "st=$(basename $s); "
-        "name=$(cat $s/name 2>/dev/null); "
-        "time=$(cat $s/time 2>/dev/null); "
-        "usage=$(cat $s/usage 2>/dev/null); "
-        "echo $c $st $name $time $usage; "
-        "done; "
-        "done"
-    )
-    per_core = parse_cpu_idle_output(raw)
-    return CPUIdleInfo(per_core=per_core)
+_CPU_IDLE_CMD = (
+    "for cpu in /sys/devices/system/cpu/cpu[0-9]*; do "
+    "c=$(basename $cpu); "
+    "for s in $cpu/cpuidle/state*; do "
+    "st=$(basename $s); "
+    "name=$(cat $s/name 2>/dev/null); "
+    "time=$(cat $s/time 2>/dev/null); "
+    "usage=$(cat $s/usage 2>/dev/null); "
+    "echo $c $st $name $time $usage; "
+    "done; "
+    "done"
+)
 
 
-def _build_cpu_frequency() -> CPUFrequency:
-    raw = adb_shell(
-        "for f in /sys/devices/system/cpu/cpu*/cpufreq/scaling_cur_freq; "
-        "do echo $f: $(cat $f); done"
-    )
+def _build_cpu_idle_info(raw: Optional[str] = None) -> CPUIdleInfo:
+    if raw is None:
+        raw = adb_shell(_CPU_IDLE_CMD)
+    per_core = {
+        cpu: [CPUIdleState.model_construct(**state) for state in states]
+        for cpu, states in parse_cpu_idle_output(raw).items()
+    }
+    return CPUIdleInfo.model_construct(per_core=per_core)
+
+
+# grep -H prints "path:value" for every core in one process, with no per-core cat
+_CPU_CUR_FREQ_CMD = "grep -H . /sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_cur_freq 2>/dev/null; true"
+_CPU_MIN_FREQ_CMD = "cat /sys/devices/system/cpu/cpu[0-9]*/cpufreq/cpuinfo_min_freq 2>/dev/null"
+_CPU_MAX_FREQ_CMD = "cat /sys/devices/system/cpu/cpu[0-9]*/cpufreq/cpuinfo_max_freq 2>/dev/null"
+
+
+def _build_cpu_frequency(
+    raw: Optional[str] = None,
+    min_raw: Optional[str] = None,
+    max_raw: Optional[str] = None
+) -> CPUFrequency:
+    """Per-core frequencies; `min_raw`/`max_raw` are only read until the limits are cached."""
+    global _cpu_freq_limits
+
+    limits = _cpu_freq_limits
+    if raw is None:
+        if limits is None:
+            raw, min_raw, max_raw = adb_shell_multi([
+                _CPU_CUR_FREQ_CMD, _CPU_MIN_FREQ_CMD, _CPU_MAX_FREQ_CMD
+            ])
+        else:
+            raw = adb_shell(_CPU_CUR_FREQ_CMD)
+
+    if limits is None:
+        min_raw = min_raw or ""
+        max_raw = max_raw or ""
+        min_freqs = [int(x.strip()) for x in min_raw.split('\n') if x.strip().isdigit()]
+        max_freqs = [int(x.strip()) for x in max_raw.split('\n') if x.strip().isdigit()]
+        limits = (min(min_freqs) if min_freqs else None, max(max_freqs) if max_freqs else None)
+        if None not in limits:
+            _cpu_freq_limits = limits
+
     freq_data = parse_cpu_frequencies_detailed(raw)
 
     if "error" in freq_data:
         raise HTTPException(status_code=500, detail="Failed to parse CPU frequencies")
 
-    try:
-        min_raw = adb_shell(
-            "for f in /sys/devices/system/cpu/cpu*/cpufreq/cpuinfo_min_freq; "
-            "do cat $f; done"
-        )
-        min_freqs = [int(x.strip()) for x in min_raw.strip().split('\n') if x.strip().isdigit()]
-        min_freq = min(min_freqs) if min_freqs else freq_data["min_khz"]
-    except Exception:
-        min_freq = freq_data["min_khz"]
-
-    try:
-        max_raw = adb_shell(
-            "for f in /sys/devices/system/cpu/cpu*/cpufreq/cpuinfo_max_freq; "
-            "do cat $f; done"
-        )
-        max_freqs = [int(x.strip()) for x in max_raw.strip().split('\n') if x.strip().isdigit()]
-        max_freq = max(max_freqs) if max_freqs else freq_data["max_khz"]
-    except Exception:
-        max_freq = freq_data["max_khz"]
+    min_freq = limits[0] if limits[0] is not None else freq_data["min_khz"]
+    max_freq = limits[1] if limits[1] is not None else freq_data["max_khz"]
 
-    return CPUFrequency(
+    return CPUFrequency.model_construct(
         per_core=freq_data["per_core"],
         min_khz=min_freq,
         max_khz=max_freq,
@@ -754,21 +870,17 @@ def _build_cpu_frequency() -> CPUFrequency:
     )
 
 
-def _build_memory_info() -> MemoryInfo:
-    meminfo = adb_shell("cat /proc/meminfo")
-    data = {}
-
-    for line in meminfo.splitlines():
-        if line.startswith(("MemTotal", "MemAvailable", "SwapTotal", "SwapFree")):
-            key, val = line.split(":", 1)
-            data[key] = kb_to_mb(val.strip().split()[0])
+def _build_memory_info(meminfo: Optional[str] = None) -> MemoryInfo:
+    if meminfo is None:
+        meminfo = adb_shell("cat /proc/meminfo")
+    data = {m[1]: kb_to_mb(m[2]) for m in _MEMINFO_RE.finditer(meminfo)}
 
     total = data.get("MemTotal", 0)
     available = data.get("MemAvailable", 0)
     used = total - available
     usage_percent = round((used / total * 100), 2) if total > 0 else 0
 
-    return MemoryInfo(
+    return MemoryInfo.model_construct(
         total_mb=total,
         available_mb=available,
         used_mb=used,
@@ -778,15 +890,17 @@ def _build_memory_info() -> MemoryInfo:
     )
 
 
-def _build_storage_info() -> StorageInfo:
-    out = adb_shell("df /data | tail -1").split()
+def _build_storage_info(df_out: Optional[str] = None) -> StorageInfo:
+    if df_out is None:
+        df_out = adb_shell("df /data | tail -1")
+    out = df_out.split()
     total_kb = int(out[1])
     used_kb = int(out[2])
     free_kb = int(out[3])
 
     usage_percent = round((used_kb / total_kb * 100), 2) if total_kb > 0 else 0
 
-    return StorageInfo(
+    return StorageInfo.model_construct(
         filesystem=out[0],
         total_gb=kb_to_gb(total_kb),
         used_gb=kb_to_gb(used_kb),
@@ -798,15 +912,28 @@ def _build_storage_info() -> StorageInfo:
 def _build_storage_mounts() -> List[MountInfo]:
     raw = adb_shell("df -k")
     mounts = parse_df_output(raw)
-    return [MountInfo(**m) for m in mounts]
+    return [MountInfo.model_construct(**m) for m in mounts]
+
+
+def _get_battery_data(raw: Optional[str] = None) -> Dict[str, str]:
+    """Parsed `dumpsys battery`, shared by the battery and power builders for 2s."""
+    if raw is not None:
+        battery_data = parse_battery_output(raw)
+        _set_cached("battery_data", battery_data)
+        return battery_data
+    battery_data = _get_cached("battery_data", 2)
+    if battery_data is None:
+        battery_data = parse_battery_output(adb_shell("dumpsys battery"))
+        _set_cached("battery_data", battery_data)
+    return battery_data
 
 
-def _build_battery_info() -> BatteryInfo:
-    raw = adb_shell("dumpsys battery")
-    battery_data = parse_key_value_block(raw)
+def _build_battery_info(battery_data: Optional[Dict[str, str]] = None) -> BatteryInfo:
+    if battery_data is None:
+        battery_data = _get_battery_data()
     battery = parse_battery_level(battery_data)
 
-    return BatteryInfo(
+    return BatteryInfo.model_construct(
         level=battery["level"],
         health=battery["health"],
         status=battery["status"],
@@ -817,9 +944,9 @@ def _build_battery_info() -> BatteryInfo:
     )
 
 
-def _build_power_info() -> PowerInfo:
-    raw = adb_shell("dumpsys battery")
-    battery_data = parse_key_value_block(raw)
+def _build_power_info(battery_data: Optional[Dict[str, str]] = None) -> PowerInfo:
+    if battery_data is None:
+        battery_data = _get_battery_data()
     
     # Extract power consumption data
     current_ma = int(battery_data.get("current now", "0"))
@@ -852,7 +979,7 @@ def _build_power_info() -> PowerInfo:
         elif status == "full" or status == "5":
             charging_status = "full"
     
-    return PowerInfo(
+    return PowerInfo.model_construct(
         current_ma=current_ma,
         charge_counter=charge_counter,
         max_charging_current=max_charging_current,
@@ -860,9 +987,16 @@ def _build_power_info() -> PowerInfo:
     )
 
 
-def _build_thermal_info() -> ThermalInfo:
-    raw = adb_shell("dumpsys thermalservice")
-    temps = parse_thermal_data(raw)
+def _get_thermal_data(raw: Optional[str] = None) -> Dict[str, Any]:
+    """Parsed `dumpsys thermalservice`, shared by the thermal and core temperature builders."""
+    if raw is None:
+        raw = adb_shell("dumpsys thermalservice")
+    return parse_thermal_data(raw)
+
+
+def _build_thermal_info(temps: Optional[Dict[str, Any]] = None) -> ThermalInfo:
+    if temps is None:
+        temps = _get_thermal_data()
 
     if not temps or "raw" in temps:
         raise HTTPException(status_code=500, detail="Failed to parse thermal data")
@@ -873,51 +1007,77 @@ def _build_thermal_info() -> ThermalInfo:
 
     simple_temps = {name: data["value"] for name, data in temps.items()}
 
-    return ThermalInfo(
+    return ThermalInfo.model_construct(
         temperatures=simple_temps,
         max_temp_c=max_temp,
         min_temp_c=min_temp
     )
 
 
-def _build_core_temperatures() -> CoreTemperatures:
-    raw = adb_shell("dumpsys thermalservice")
-    temps = parse_thermal_data(raw)
+def _build_core_temperatures(temps: Optional[Dict[str, Any]] = None) -> CoreTemperatures:
+    if temps is None:
+        temps = _get_thermal_data()
 
     per_core = {}
     if temps and "raw" not in temps:
         for name, data in temps.items():
-            if re.match(r"^cpu\d+$", name.lower()):
-                per_core[name.lower()] = float(data.get("value", 0))
+            lname = name.lower()
+            if lname.startswith("cpu") and _CPU_CORE_RE.match(lname):
+                per_core[lname] = float(data.get("value", 0))
 
     available = bool(per_core)
-    return CoreTemperatures(
+    return CoreTemperatures.model_construct(
         per_core=per_core,
         source="thermalservice",
         available=available
     )
 
 
+# Every concurrent /system caller waits on this one batch, so bound it near the
+# old per-command adb_shell 10s rather than scaling it with the command count
+_SYSTEM_BATCH_TIMEOUT = 15
+
+
+def _get_realtime_outputs() -> Dict[str, str]:
+    """Raw output of every uncached /system command, fetched in one adb_shell_multi batch."""
+    cmds = {
+        "cpu_freq": _CPU_CUR_FREQ_CMD,
+        "cpu_idle": _CPU_IDLE_CMD,
+        "meminfo": "cat /proc/meminfo",
+        "storage": "df /data | tail -1",
+        "battery": "dumpsys battery",
+        "thermal": "dumpsys thermalservice",
+    }
+    if _cpu_freq_limits is None:
+        cmds["cpu_min_freq"] = _CPU_MIN_FREQ_CMD
+        cmds["cpu_max_freq"] = _CPU_MAX_FREQ_CMD
+    outputs = adb_shell_multi(list(cmds.values()), timeout=_SYSTEM_BATCH_TIMEOUT)
+    if not any(outputs):
+        # adb_shell_multi blanks every slot on timeout/failure; say so instead
+        # of failing later on whichever section parses first
+        raise RuntimeError("ADB batch for /system returned no output (timeout or adb failure)")
+    return dict(zip(cmds, outputs))
+
+
 def _build_uptime_info() -> UptimeInfo:
     result = adb_shell("cat /proc/uptime")
     uptime_seconds = int(float(result.split()[0]))
 
-    days = uptime_seconds // 86400
-    hours = (uptime_seconds % 86400) // 3600
-    minutes = (uptime_seconds % 3600) // 60
-    seconds = uptime_seconds % 60
+    days, rem = divmod(uptime_seconds, 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes, seconds = divmod(rem, 60)
 
-    if days > 0:
-        formatted = f"{days}d {hours}h {minutes}m {seconds}s"
-    elif hours > 0:
-        formatted = f"{hours}h {minutes}m {seconds}s"
-    else:
-        formatted = f"{minutes}m {seconds}s"
+    # Leading units are dropped while zero: "1d 0h 5m 3s", "2h 0m 9s", "0m 7s"
+    parts = [f"{days}d"] if days else []
+    if days or hours:
+        parts.append(f"{hours}h")
+    parts += [f"{minutes}m", f"{seconds}s"]
+    formatted = " ".join(parts)
 
     now = datetime.now()
     boot_time = now - timedelta(seconds=uptime_seconds)
 
-    return UptimeInfo(
+    return UptimeInfo.model_construct(
         uptime_seconds=uptime_seconds,
         uptime_formatted=formatted,
         boot_time=boot_time
@@ -925,26 +1085,22 @@ def _build_uptime_info() -> UptimeInfo:
 
 
 def _build_network_info() -> NetworkInfo:
-    hostname, wifi_ip, carrier, network_type, data_state = adb_shell_multi([
-        "getprop net.hostname",
-        "getprop dhcp.wlan0.ipaddress",
+    # The ip fallback rides along in the batch; it is only used when the DHCP prop is empty.
+    # The often-unset props (net.hostname, dhcp.*) don't lead the batch.
+    wifi_mac, ip_out, carrier, network_type, data_state, wifi_ip, hostname = adb_shell_multi([
+        "cat /sys/class/net/wlan0/address",
+        "ip -o -4 addr show wlan0",
         "getprop gsm.operator.alpha",
         "getprop gsm.network.type",
-        "getprop gsm.data.state"
+        "getprop gsm.data.state",
+        "getprop dhcp.wlan0.ipaddress",
+        "getprop net.hostname"
     ])
     if not wifi_ip:
-        try:
-            ip_out = adb_shell("ip -f inet addr show wlan0 | grep inet | awk '{print $2}' | head -n 1")
-            wifi_ip = ip_out.split("/")[0] if ip_out else ""
-        except Exception:
-            wifi_ip = ""
-
-    try:
-        wifi_mac = adb_shell("cat /sys/class/net/wlan0/address")
-    except Exception:
-        wifi_mac = ""
+        # "3: wlan0    inet 192.168.1.50/24 brd ..."
+        wifi_ip = ip_out.split("inet ", 1)[1].split("/", 1)[0].strip() if "inet " in ip_out else ""
 
-    return NetworkInfo(
+    return NetworkInfo.model_construct(
         hostname=hostname or "android",
         wifi_ip=wifi_ip or None,
         wifi_mac=wifi_mac or None,
@@ -955,8 +1111,10 @@ def _build_network_info() -> NetworkInfo:
 
 
 def _build_display_info() -> DisplayInfo:
-    size_out = adb_shell("wm size | head -n 1")
-    density_out = adb_shell("wm density | head -n 1")
+    size_out, density_out = adb_shell_multi(["wm size", "wm density"])
+    # Only the first line (the physical value) is used; overrides follow it
+    size_out = size_out.partition("\n")[0]
+    density_out = density_out.partition("\n")[0]
 
     size_px = "unknown"
     if ":" in size_out:
@@ -970,7 +1128,7 @@ def _build_display_info() -> DisplayInfo:
         except ValueError:
             density_dpi = 0
 
-    return DisplayInfo(
+    return DisplayInfo.model_construct(
         size_px=size_px,
         density_dpi=density_dpi
     )
@@ -1,116 +1,99 @@
+import re
+from typing import Dict, Optional
+
+# Powers of two, so multiplying by these is exact and matches dividing
+_KB_TO_MB = 1.0 / 1024
+_KB_TO_GB = 1.0 / (1024 * 1024)
+
+# getprop dump line: [key]: [value]
+_GETPROP_RE = re.compile(r"^\[([^\]]+)\]: \[([^\]]*)\]", re.M)
+
+# "key: value" line, split on the first colon, both sides stripped
+_KV_RE = re.compile(r"^[ \t]*([^:\r\n]*[^:\s])[ \t]*:[ \t]*([^\r\n]*\S)", re.M | re.ASCII)
+
+# "<path>: <value>" line keyed by the first cpuN component of the path, e.g.
+# /sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq: 1800000
+_CPU_PATH = r"^[ \t]*(?:[^:\r\n]*?/)??(cpu\d+)(?=/|[ \t]*:)[^:\r\n]*:[ \t]*"
+_CPU_FREQ_RE = re.compile(_CPU_PATH + r"(\d+)[ \t\r]*$", re.M | re.ASCII)
+_CPU_PATH_VALUE_RE = re.compile(_CPU_PATH + r"([^\r\n]*?)[ \t\r]*$", re.M | re.ASCII)
+
+# df -k row: filesystem, size, used, available, use%, mountpoint (may contain spaces)
+_DF_RE = re.compile(
+    r"^[ \t]*(\S+)[ \t]+(\d+)[ \t]+(\d+)[ \t]+(\d+)[ \t]+(\d+)%[ \t]+(\S(?:[^\r\n]*\S)?)",
+    re.M | re.ASCII,
+)
+
+# cpuidle row: cpu, state, name, time_us, usage
+_CPU_IDLE_RE = re.compile(r"^[ \t]*(\S+)[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\d+)[ \t]+(\d+)\b", re.M | re.ASCII)
+
+# thermalservice entry: Temperature{mValue=39.5, mType=0, mName=AP, mStatus=0}
+# (mValue is a Java float, so NaN, Infinity and exponents can show up)
+_TEMPERATURE_RE = re.compile(
+    r"Temperature\{mValue=([-+]?(?:\d+(?:\.\d*)?(?:E[-+]?\d+)?|NaN|Infinity)), "
+    r"mType=(-?\d+), mName=([^,}]*), mStatus=(-?\d+)\}",
+    re.ASCII,
+)
+
+# `dumpsys battery` lines for the fields the battery and power endpoints use
+_BATTERY_RE = re.compile(
+    r"^[ \t]*(level|health|status|voltage|temperature|technology|AC powered|USB powered"
+    r"|current now|Charge counter|Max charging current)[ \t]*:[ \t]*([^\r\n]*\S)",
+    re.M | re.ASCII,
+)
+
+
 def parse_key_value_block(text: str):
     """Parse key-value pairs from dumpsys output."""
-    data = {}
-    for line in text.splitlines():
-        if ":" in line:
-            k, v = line.split(":", 1)
-            key = k.strip()
-            val = v.strip()
-            # Skip empty keys and values
-            if key and val:
-                data[key] = val
-    return data
-
-
-def parse_cpu_freq(text: str):
-    """Parse CPU frequency from scaling_cur_freq files."""
-    freqs = {}
-    for line in text.splitlines():
-        if ":" in line:
-            path, value = line.split(":", 1)
-            try:
-                # Extract cpu number from path like /sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq
-                # Split path and find "cpu0", "cpu1", etc.
-                path_parts = path.strip().split("/")
-                cpu_part = None
-                for part in path_parts:
-                    if part.startswith("cpu") and part[3:].isdigit():
-                        cpu_part = part
-                        break
-                
-                if cpu_part:
-                    freqs[cpu_part] = int(value.strip())
-            except (ValueError, IndexError):
-                continue
-    return freqs if freqs else {"error": "Could not parse CPU frequencies"}
+    # Lines with an empty key or value don't match
+    return {m[1]: m[2] for m in _KV_RE.finditer(text)}
+
+
+def parse_getprop_output(text: str) -> dict:
+    """Parse a full `getprop` dump into a property dict."""
+    return {m[1]: m[2] for m in _GETPROP_RE.finditer(text)}
+
+
+def parse_battery_output(text: str) -> dict:
+    """Parse the battery and power fields out of `dumpsys battery` output."""
+    return {m[1]: m[2] for m in _BATTERY_RE.finditer(text)}
+
+
+def parse_cpu_freq(text: str) -> Optional[Dict[str, int]]:
+    """Parse CPU frequency from scaling_cur_freq files; None if no core could be read."""
+    freqs = {m[1]: int(m[2]) for m in _CPU_FREQ_RE.finditer(text)}
+    return freqs or None
 
 
 def parse_path_value_block(text: str) -> dict:
     """Parse path: value lines and map to cpuX key with raw string value."""
-    values = {}
-    for line in text.splitlines():
-        if ":" in line:
-            path, value = line.split(":", 1)
-            try:
-                path_parts = path.strip().split("/")
-                cpu_part = None
-                for part in path_parts:
-                    if part.startswith("cpu") and part[3:].isdigit():
-                        cpu_part = part
-                        break
-                if cpu_part:
-                    values[cpu_part] = value.strip()
-            except (ValueError, IndexError):
-                continue
-    return values
+    return {m[1]: m[2] for m in _CPU_PATH_VALUE_RE.finditer(text)}
 
 
 def parse_df_output(text: str) -> list:
     """Parse df -k output into a list of mount dictionaries."""
-    mounts = []
-    lines = [l for l in text.splitlines() if l.strip()]
-    if not lines:
-        return mounts
-
-    for line in lines[1:]:
-        parts = line.split()
-        if len(parts) < 6:
-            continue
-        filesystem = parts[0]
-        size_kb = int(parts[1]) if parts[1].isdigit() else 0
-        used_kb = int(parts[2]) if parts[2].isdigit() else 0
-        avail_kb = int(parts[3]) if parts[3].isdigit() else 0
-        use_percent = parts[4].strip().rstrip("%")
-        try:
-            use_percent = int(use_percent)
-        except ValueError:
-            use_percent = 0
-        mountpoint = " ".join(parts[5:])
-
-        mounts.append({
-            "filesystem": filesystem,
-            "size_kb": size_kb,
-            "used_kb": used_kb,
-            "available_kb": avail_kb,
-            "use_percent": use_percent,
-            "mountpoint": mountpoint
-        })
-
-    return mounts
+    # The header row never matches: its size columns aren't numeric
+    return [
+        {
+            "filesystem": m[1],
+            "size_kb": int(m[2]),
+            "used_kb": int(m[3]),
+            "available_kb": int(m[4]),
+            "use_percent": int(m[5]),
+            "mountpoint": m[6]
+        }
+        for m in _DF_RE.finditer(text)
+    ]
 
 
 def parse_cpu_idle_output(text: str) -> dict:
     """Parse CPU idle state lines into per-core structures."""
     per_core = {}
-    for line in text.splitlines():
-        parts = line.split()
-        if len(parts) < 5:
-            continue
-        cpu, state, name, time_str, usage_str = parts[:5]
-        try:
-            time_us = int(time_str)
-        except ValueError:
-            time_us = 0
-        try:
-            usage = int(usage_str)
-        except ValueError:
-            usage = 0
-
-        per_core.setdefault(cpu, []).append({
-            "state": state,
-            "name": name,
-            "time_us": time_us,
-            "usage": usage
+    for m in _CPU_IDLE_RE.finditer(text):
+        per_core.setdefault(m[1], []).append({
+            "state": m[2],
+            "name": m[3],
+            "time_us": int(m[4]),
+            "usage": int(m[5])
         })
     return per_core
 
@@ -118,76 +101,59 @@ def parse_cpu_idle_output(text: str) -> dict:
 def parse_cpu_frequencies_detailed(text: str) -> dict:
     """Parse CPU frequencies with min/max calculations."""
     freqs = parse_cpu_freq(text)
+
+    if freqs is None:
+        return {"error": "Could not parse CPU frequencies"}
     
-    if "error" in freqs:
-        return freqs
-    
-    # Extract numeric frequencies only
-    freq_values = [f for f in freqs.values() if isinstance(f, int)]
-    
-    if not freq_values:
-        return {"error": "No valid frequencies found"}
-    
+    # parse_cpu_freq only yields ints, so no per-value type filtering is needed
+    freq_values = freqs.values()
+    lo = min(freq_values)
+    hi = max(freq_values)
+    count = len(freqs)
+
     return {
         "per_core": freqs,
-        "min_khz": min(freq_values),
-        "max_khz": max(freq_values),
-        "min_mhz": round(min(freq_values) / 1000, 2),
-        "max_mhz": round(max(freq_values) / 1000, 2),
-        "avg_mhz": round(sum(freq_values) / len(freq_values) / 1000, 2),
-        "core_count": len(freq_values)
+        "min_khz": lo,
+        "max_khz": hi,
+        "min_mhz": round(lo / 1000, 2),
+        "max_mhz": round(hi / 1000, 2),
+        "avg_mhz": round(sum(freq_values) / count / 1000, 2),
+        "core_count": count
     }
 
 
 def parse_thermal_data(text: str):
     """Parse thermal service output and extract temperatures."""
-    temps = {}
-    for line in text.splitlines():
-        if "Temperature{" in line:
-            # Extract temperature data from format: Temperature{mValue=39.5, mType=0, mName=AP, mStatus=0}
-            try:
-                parts = line.split("Temperature{")[1].rstrip("}")
-                items = [item.strip() for item in parts.split(", ")]
-                temp_data = {}
-                for item in items:
-                    if "=" in item:
-                        k, v = item.split("=", 1)
-                        temp_data[k.strip()] = v.strip()
-                
-                if "mName" in temp_data:
-                    name = temp_data["mName"]
-                    temps[name] = {
-                        "value": float(temp_data.get("mValue", 0)),
-                        "type": temp_data.get("mType", ""),
-                        "status": temp_data.get("mStatus", "")
-                    }
-            except (IndexError, ValueError):
-                continue
+    temps = {
+        m[3]: {"value": float(m[1]), "type": m[2], "status": m[4]}
+        for m in _TEMPERATURE_RE.finditer(text)
+    }
     return temps if temps else {"raw": text[:500]}
 
 
 def parse_battery_level(data: dict) -> dict:
     """Extract key battery metrics from parsed data."""
+    get = data.get
     return {
-        "level": int(data.get("level", 0)),
-        "health": data.get("health", "unknown"),
-        "status": data.get("status", "unknown"),
-        "voltage_mv": int(data.get("voltage", 0)),
-        "temperature_c": round(int(data.get("temperature", 0)) / 10, 1),
-        "technology": data.get("technology", "unknown"),
-        "is_charging": data.get("AC powered", "").lower() == "true" or 
-                       data.get("USB powered", "").lower() == "true"
+        "level": int(get("level", 0)),
+        "health": get("health", "unknown"),
+        "status": get("status", "unknown"),
+        "voltage_mv": int(get("voltage", 0)),
+        "temperature_c": round(int(get("temperature", 0)) / 10, 1),
+        "technology": get("technology", "unknown"),
+        "is_charging": get("AC powered", "").lower() == "true" or
+                       get("USB powered", "").lower() == "true"
     }
 
 
 def kb_to_mb(value: str) -> float:
     """Convert KB to MB."""
     try:
-        return round(int(value) / 1024, 2)
+        return round(int(value) * _KB_TO_MB, 2)
     except ValueError:
         return 0.0
 
 
 def kb_to_gb(value: int) -> float:
     """Convert KB to GB."""
-    return round(value / (1024 * 1024), 2)
+    return round(value * _KB_TO_GB, 2)
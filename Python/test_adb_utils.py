@@ -0,0 +1,55 @@
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+import adb_utils
+
+# Stand-in for the adb client: `adb shell` runs a local sh
+_ADB_STUB = """#!/bin/sh
+if [ "$1" = "-s" ]; then shift 2; fi
+case "$1" in
+  shell) shift; if [ $# -eq 0 ]; then exec sh; else exec sh -c "$*"; fi;;
+  *) echo "unsupported: $1" >&2; exit 1;;
+esac
+"""
+
+
+class AdbShellMultiTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._bindir = tempfile.mkdtemp()
+        adb = os.path.join(cls._bindir, "adb")
+        with open(adb, "w") as f:
+            f.write(_ADB_STUB)
+        os.chmod(adb, os.stat(adb).st_mode | stat.S_IEXEC)
+        cls._path = os.environ.get("PATH", "")
+        os.environ["PATH"] = cls._bindir + os.pathsep + cls._path
+        adb_utils.adb_close_sessions()
+
+    @classmethod
+    def tearDownClass(cls):
+        adb_utils.adb_close_sessions()
+        os.environ["PATH"] = cls._path
+        shutil.rmtree(cls._bindir)
+
+    def test_outputs_align_with_commands(self):
+        self.assertEqual(adb_utils.adb_shell_multi(["echo a", "echo b"]), ["a", "b"])
+
+    def test_batch_starting_with_empty_output(self):
+        self.assertEqual(adb_utils.adb_shell_multi(["true", "echo 5"]), ["", "5"])
+        self.assertEqual(adb_utils.adb_shell_multi(["true", "true", "echo 9"]), ["", "", "9"])
+
+    def test_batch_ending_with_empty_output(self):
+        self.assertEqual(adb_utils.adb_shell_multi(["echo 1", "true"]), ["1", ""])
+
+    def test_trailing_comment_and_background_job(self):
+        self.assertEqual(
+            adb_utils.adb_shell_multi(["echo a # comment", "(sleep 0.2; echo b) &", "echo c"]),
+            ["a", "b", "c"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()